@@ -14,15 +14,25 @@ Architecture Overview:
     3. **extract_entities**  → Pulls out customer name, order ID, dates, etc.
     4. **generate_response** → Crafts a customer-facing reply and internal notes.
 
-    The LLM autonomously decides which tool to call next via the Groq
-    function-calling API. Results from earlier steps are fed into later
-    steps so the agent builds up context progressively.
+    By default all four steps are answered by one combined JSON-mode LLM
+    call.  If that reply fails validation (or ``AGENT_SINGLE_SHOT=0``),
+    the steps run as a hard-coded async DAG: ``analyze_ticket`` and
+    ``extract_entities`` run concurrently, ``classify_ticket`` waits on
+    the analysis, and ``generate_response`` waits on all three.  LLM
+    replies are cached (see ``cache.py``).  The original agent loop,
+    where the LLM decides which tool to call next via the Groq
+    function-calling API, is still available with ``use_planner=True``
+    or ``AGENT_USE_LLM_PLANNER=1``.
 
 Key Components:
     - ``TOOLS``: OpenAI-compatible tool/function schema definitions.
     - ``TOOL_MAP``: Maps tool names to their Python implementations.
     - ``AGENT_SYSTEM``: System prompt that instructs the LLM on the workflow.
-    - ``process_ticket()``: Main entry point — runs the full agent loop.
+    - ``process_ticket_async()``: Async entry point — runs the pipeline.
+    - ``process_ticket_direct()``: The fixed four-step graph, no planner.
+    - ``process_ticket()``: Synchronous wrapper around ``process_ticket_async()``.
+    - ``groq_session()``: Opens (and finally closes) the shared Groq client.
+    - ``warmup()``: Loads the embedding model and primes the connection pool.
 
 Usage:
     >>> from agent import process_ticket
@@ -32,23 +42,115 @@ Usage:
                'generate_response', 'final_summary'])
 """
 
+import asyncio
+import contextlib
+import contextvars
 import json
-import re
-from groq import Groq
-from config import GROQ_API_KEY, MODEL_NAME
+import httpx
+from groq import AsyncGroq, BadRequestError, DefaultAioHttpClient, RateLimitError
+from cache import async_lru_cache, llm_cache
+from parsing import json_object_end, regex_entities
+from config import (
+    CONNECT_TIMEOUT,
+    GROQ_API_KEY,
+    MAX_CONCURRENCY,
+    MAX_RETRIES,
+    MODEL_NAME,
+    RATE_LIMIT_BACKOFF,
+    RATE_LIMIT_RETRIES,
+    REQUEST_TIMEOUT,
+    SEMANTIC_CACHE_ENABLED,
+    USE_LLM_PLANNER,
+    USE_SINGLE_SHOT,
+)
 
 # ──────────────────────────────────────────────────────────────
 # Groq client initialisation
 # ──────────────────────────────────────────────────────────────
-client = Groq(api_key=GROQ_API_KEY)
+# The aiohttp backend shares one ClientSession (connection pool +
+# keep-alive) across every call made through a client, which scales
+# better than the default httpx backend under concurrent load.  That
+# pool is bound to the event loop it was created on and must be
+# closed before the loop exits, so the client is opened per event
+# loop by ``groq_session()`` and published to every call (and every
+# task spawned) inside it through a context variable.  The SDK
+# retries transient failures itself; keep-alive limits are sized for
+# large concurrent batches.
+# ──────────────────────────────────────────────────────────────
+_aclient = contextvars.ContextVar("_aclient", default=None)
+
+# Caps concurrent tickets so batch runs respect Groq's rate limits.
+# Like the client, it belongs to a single session and event loop.
+_semaphore = contextvars.ContextVar("_semaphore", default=None)
+
+
+@contextlib.asynccontextmanager
+async def groq_session():
+    """Open the Groq client used by every LLM call inside the block.
+
+    The client (and its aiohttp connection pool) is closed when the
+    block exits, so wrap each ``asyncio.run`` entry point in one::
+
+        async with groq_session():
+            results = await process_ticket_async(ticket_text)
+
+    Yields:
+        The ``AsyncGroq`` client for this session.
+    """
+    async with AsyncGroq(
+        api_key=GROQ_API_KEY,
+        max_retries=MAX_RETRIES,
+        timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT),
+        http_client=DefaultAioHttpClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        ),
+    ) as aclient:
+        client_token = _aclient.set(aclient)
+        semaphore_token = _semaphore.set(asyncio.Semaphore(MAX_CONCURRENCY))
+        try:
+            yield aclient
+        finally:
+            _semaphore.reset(semaphore_token)
+            _aclient.reset(client_token)
+
+
+def _get_aclient() -> AsyncGroq:
+    """Return the ``AsyncGroq`` client of the enclosing ``groq_session()``."""
+    aclient = _aclient.get()
+    if aclient is None:
+        raise RuntimeError("No Groq session is open; use `async with groq_session():`")
+    return aclient
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Return the ticket-concurrency semaphore of the enclosing ``groq_session()``."""
+    semaphore = _semaphore.get()
+    if semaphore is None:
+        raise RuntimeError("No Groq session is open; use `async with groq_session():`")
+    return semaphore
+
+
+async def warmup():
+    """Pay one-off start-up costs before the first ticket arrives.
+
+    Loads the semantic cache's embedding model (~500 ms on first use)
+    when ``SEMANTIC_CACHE_ENABLED`` is set, and opens a pooled
+    connection to Groq with a cheap ``models.list`` request, so neither
+    cost lands on the first ticket's latency.
+    """
+    if SEMANTIC_CACHE_ENABLED:
+        await asyncio.to_thread(llm_cache.warmup)
+    await _get_aclient().models.list()
+
 
 # ──────────────────────────────────────────────────────────────
 # Tool / Function Schemas (OpenAI-compatible format)
 # ──────────────────────────────────────────────────────────────
 # Each schema tells the LLM *what* a tool does and *which*
-# parameters it accepts so it can decide when to call it.
+# parameters it accepts so it can decide when to call it.  Kept
+# as a tuple since it is shared, read-only, by every planner call.
 # ──────────────────────────────────────────────────────────────
-TOOLS = [
+TOOLS = (
     {
         "type": "function",
         "function": {
@@ -133,45 +235,186 @@ TOOLS = [
             },
         },
     },
-]
+)
 
 # ──────────────────────────────────────────────────────────────
 # LLM Helper
 # ──────────────────────────────────────────────────────────────
 
-def _llm(system: str, user: str) -> str:
+async def _create_completion(**kwargs):
+    """Call ``chat.completions.create`` with extra backoff on rate limits.
+
+    The SDK already retries 429s ``MAX_RETRIES`` times, honouring
+    ``Retry-After``.  When Groq keeps rejecting requests beyond that
+    (typically a saturated per-minute token budget during a large
+    batch), wait ``RATE_LIMIT_BACKOFF * 2**attempt`` seconds and try
+    again, up to ``RATE_LIMIT_RETRIES`` times, rather than failing the
+    whole ticket.  Each round repeats the SDK's retries, so the worst
+    case is ``(RATE_LIMIT_RETRIES + 1) * (MAX_RETRIES + 1)`` = 18 HTTP
+    attempts; keep the outer rounds few and long so they add little
+    load while Groq is throttling.
+
+    Args:
+        **kwargs: Passed through to ``chat.completions.create``.
+
+    Returns:
+        The completion (or stream) returned by the SDK.
+
+    Raises:
+        RateLimitError: If the request is still rate-limited after
+                        ``RATE_LIMIT_RETRIES`` backoff rounds.
+    """
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        try:
+            return await _get_aclient().chat.completions.create(**kwargs)
+        except RateLimitError:
+            if attempt == RATE_LIMIT_RETRIES:
+                raise
+            await asyncio.sleep(RATE_LIMIT_BACKOFF * 2 ** attempt)
+
+
+@llm_cache.cached
+async def _allm(
+    system: str, user: str, max_tokens: int = 1024, json_mode: bool = False
+) -> str:
     """Send a one-shot request to the Groq LLM and return the text response.
 
     This is the low-level helper used by every tool function.  It creates
     a simple two-message conversation (system + user) and returns the
     assistant's reply as a plain string.
 
+    By default the reply is streamed and the stream is closed as soon
+    as the first top-level JSON object is complete, so any trailing
+    tokens the model would still emit are never waited for; text before
+    the object is dropped too.  Groq documents JSON mode as unsupported
+    with streaming, so ``json_mode`` requests are sent unstreamed.
+
+    Responses are served from ``llm_cache`` when the same prompt has
+    been answered before.  Callers may pass ``semantic=True`` (consumed
+    by the cache) to also accept a near-identical earlier prompt; the
+    analysis and classification steps do so only when
+    ``SEMANTIC_CACHE_ENABLED`` is set, since their free-text fields
+    usually carry customer details.  A ``validate`` callable may also be
+    passed; replies it rejects with ``ValueError`` are never cached.
+
     Args:
         system: The system prompt that defines the LLM's persona and
                 output format (e.g. "return ONLY valid JSON").
         user:   The user-facing content — typically the ticket text,
                 optionally enriched with prior analysis results.
+        max_tokens: Upper bound on the length of the reply.
+        json_mode:  Ask Groq to constrain the reply to a valid JSON
+                    object (``response_format={"type": "json_object"}``)
+                    instead of streaming it.
 
     Returns:
         The stripped text content of the LLM's response.
     """
-    resp = client.chat.completions.create(
+    request = dict(
         model=MODEL_NAME,
         messages=[
             {"role": "system", "content": system},
             {"role": "user", "content": user},
         ],
         temperature=0.3,   # Low temperature for consistent, factual output
-        max_tokens=1024,
+        max_tokens=max_tokens,
     )
-    return resp.choices[0].message.content.strip()
+
+    if json_mode:
+        resp = await _create_completion(**request, response_format={"type": "json_object"})
+        return resp.choices[0].message.content.strip()
+
+    stream = await _create_completion(**request, stream=True)
+    buf = ""
+    try:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content or ""
+            buf += delta
+            if "}" in delta:
+                start = buf.find("{")
+                end = json_object_end(buf[start:]) if start != -1 else -1
+                if end != -1:
+                    buf = buf[start:start + end]
+                    break
+    finally:
+        # Closing early aborts the HTTP response instead of draining it.
+        await stream.close()
+    return buf.strip()
+
+
+def _require_json_object(reply: str) -> dict:
+    """Parse ``reply`` as a JSON object.
+
+    Used as the cache validator for every tool's LLM call, so a reply
+    cut off at ``max_tokens`` or holding no JSON object is never stored.
+
+    Args:
+        reply: Raw text returned by ``_allm()``.
+
+    Returns:
+        The decoded object.
+
+    Raises:
+        ValueError: If ``reply`` is not a valid JSON object.
+    """
+    value = json.loads(reply)
+    if not isinstance(value, dict):
+        raise ValueError("LLM reply is not a JSON object")
+    return value
+
+
+# ──────────────────────────────────────────────────────────────
+# Tool System Prompts
+# ──────────────────────────────────────────────────────────────
+# Built once at import and passed by reference on every call.
+# ──────────────────────────────────────────────────────────────
+_ANALYZE_SYS = (
+    "You are a support ticket analyst. Analyze the ticket and return a JSON object with:\n"
+    '- "intent": what the customer wants\n'
+    '- "sentiment": positive / neutral / negative / angry\n'
+    '- "urgency": low / medium / high / critical\n'
+    '- "summary": one-line summary\n'
+    "Return ONLY valid JSON."
+)
+
+_CLASSIFY_SYS = (
+    "You are a ticket routing specialist. Based on the ticket and its analysis, return a JSON object with:\n"
+    '- "department": one of [Billing, Technical Support, Sales, Account Management, Product Feedback, General Inquiry]\n'
+    '- "priority": one of [P1-Critical, P2-High, P3-Medium, P4-Low]\n'
+    '- "reason": brief justification\n'
+    "Return ONLY valid JSON."
+)
+
+_EXTRACT_SYS = (
+    "You are an entity extraction specialist. Extract key entities from the ticket and return a JSON object with:\n"
+    '- "customer_name": if mentioned\n'
+    '- "order_id": any order/reference numbers\n'
+    '- "product": product or service mentioned\n'
+    '- "dates": any dates mentioned\n'
+    '- "contact_info": email/phone if present\n'
+    '- "issue_keywords": list of key issue terms\n'
+    "Use null for fields not found. Return ONLY valid JSON."
+)
+
+_RESPOND_SYS = (
+    "You are a professional customer support agent. Generate a helpful, empathetic response.\n"
+    "If priority is P1-Critical or P2-High, include an escalation note.\n"
+    "Return a JSON object with:\n"
+    '- "response": the customer-facing reply\n'
+    '- "internal_note": note for the support team\n'
+    '- "escalation_needed": true/false\n'
+    "Return ONLY valid JSON."
+)
 
 
 # ──────────────────────────────────────────────────────────────
 # Tool Implementations
 # ──────────────────────────────────────────────────────────────
 
-def analyze_ticket(ticket_text: str) -> str:
+@async_lru_cache(maxsize=1024)
+async def analyze_ticket(ticket_text: str) -> str:
     """Step 1 — Analyse intent, sentiment, urgency, and provide a summary.
 
     Sends the raw ticket to the LLM with a prompt that asks for a JSON
@@ -187,18 +430,17 @@ def analyze_ticket(ticket_text: str) -> str:
     Returns:
         A JSON-formatted string with the analysis results.
     """
-    system = (
-        "You are a support ticket analyst. Analyze the ticket and return a JSON object with:\n"
-        '- "intent": what the customer wants\n'
-        '- "sentiment": positive / neutral / negative / angry\n'
-        '- "urgency": low / medium / high / critical\n'
-        '- "summary": one-line summary\n'
-        "Return ONLY valid JSON."
+    return await _allm(
+        _ANALYZE_SYS,
+        ticket_text,
+        max_tokens=512,
+        semantic=SEMANTIC_CACHE_ENABLED,
+        validate=_require_json_object,
     )
-    return _llm(system, ticket_text)
 
 
-def classify_ticket(ticket_text: str, analysis: str) -> str:
+@async_lru_cache(maxsize=1024)
+async def classify_ticket(ticket_text: str, analysis: str) -> str:
     """Step 2 — Route the ticket to a department and assign priority.
 
     Uses both the original ticket and the analysis from Step 1 to
@@ -219,18 +461,18 @@ def classify_ticket(ticket_text: str, analysis: str) -> str:
         A JSON-formatted string with ``department``, ``priority``,
         and ``reason`` fields.
     """
-    system = (
-        "You are a ticket routing specialist. Based on the ticket and its analysis, return a JSON object with:\n"
-        '- "department": one of [Billing, Technical Support, Sales, Account Management, Product Feedback, General Inquiry]\n'
-        '- "priority": one of [P1-Critical, P2-High, P3-Medium, P4-Low]\n'
-        '- "reason": brief justification\n'
-        "Return ONLY valid JSON."
-    )
     user = f"Ticket:\n{ticket_text}\n\nAnalysis:\n{analysis}"
-    return _llm(system, user)
+    return await _allm(
+        _CLASSIFY_SYS,
+        user,
+        max_tokens=512,
+        semantic=SEMANTIC_CACHE_ENABLED,
+        validate=_require_json_object,
+    )
 
 
-def extract_entities(ticket_text: str) -> str:
+@async_lru_cache(maxsize=1024)
+async def extract_entities(ticket_text: str) -> str:
     """Step 3 — Extract structured entities from the ticket text.
 
     Identifies and extracts key information such as:
@@ -243,26 +485,27 @@ def extract_entities(ticket_text: str) -> str:
 
     Fields not found in the ticket are set to ``null``.
 
+    Order IDs, dates and contact details are matched locally with
+    regular expressions.  The LLM is only consulted when none of them
+    are present, since the ticket then needs language understanding to
+    yield anything useful.
+
     Args:
         ticket_text: The raw customer support ticket string.
 
     Returns:
         A JSON-formatted string with the extracted entities.
     """
-    system = (
-        "You are an entity extraction specialist. Extract key entities from the ticket and return a JSON object with:\n"
-        '- "customer_name": if mentioned\n'
-        '- "order_id": any order/reference numbers\n'
-        '- "product": product or service mentioned\n'
-        '- "dates": any dates mentioned\n'
-        '- "contact_info": email/phone if present\n'
-        '- "issue_keywords": list of key issue terms\n'
-        "Use null for fields not found. Return ONLY valid JSON."
+    entities = regex_entities(ticket_text)
+    if any(value is not None for value in entities.values()):
+        return json.dumps(entities)
+    return await _allm(
+        _EXTRACT_SYS, ticket_text, max_tokens=512, validate=_require_json_object
     )
-    return _llm(system, ticket_text)
 
 
-def generate_response(
+@async_lru_cache(maxsize=1024)
+async def generate_response(
     ticket_text: str, analysis: str, classification: str, entities: str
 ) -> str:
     """Step 4 — Generate a customer-facing reply and internal notes.
@@ -284,22 +527,13 @@ def generate_response(
             - ``internal_note``     : A note for the support team.
             - ``escalation_needed`` : Boolean flag.
     """
-    system = (
-        "You are a professional customer support agent. Generate a helpful, empathetic response.\n"
-        "If priority is P1-Critical or P2-High, include an escalation note.\n"
-        "Return a JSON object with:\n"
-        '- "response": the customer-facing reply\n'
-        '- "internal_note": note for the support team\n'
-        '- "escalation_needed": true/false\n'
-        "Return ONLY valid JSON."
-    )
     user = (
         f"Ticket:\n{ticket_text}\n\n"
         f"Analysis:\n{analysis}\n\n"
         f"Classification:\n{classification}\n\n"
         f"Entities:\n{entities}"
     )
-    return _llm(system, user)
+    return await _allm(_RESPOND_SYS, user, validate=_require_json_object)
 
 
 # ──────────────────────────────────────────────────────────────
@@ -332,6 +566,121 @@ Call ONE tool at a time. After all four tools have been called, respond with
 a final summary that includes the results from every step.
 """
 
+# Opening of every planner conversation; copied with ``list()`` per ticket.
+_BASE_MESSAGES = ({"role": "system", "content": AGENT_SYSTEM},)
+
+
+# ──────────────────────────────────────────────────────────────
+# Single-Shot Pipeline
+# ──────────────────────────────────────────────────────────────
+# All four steps fused into one LLM call.  Each top-level key of
+# the combined JSON maps to the tool it replaces and the fields
+# that tool's output must contain.
+# ──────────────────────────────────────────────────────────────
+SINGLE_SHOT_SYSTEM = (
+    "You are a Customer Support Ticket Routing Agent. Process the ticket and return "
+    "ONE JSON object with exactly these four keys:\n"
+    '- "analysis": an object with\n'
+    '    - "intent": what the customer wants\n'
+    '    - "sentiment": positive / neutral / negative / angry\n'
+    '    - "urgency": low / medium / high / critical\n'
+    '    - "summary": one-line summary\n'
+    '- "classification": an object with\n'
+    '    - "department": one of [Billing, Technical Support, Sales, Account Management, Product Feedback, General Inquiry]\n'
+    '    - "priority": one of [P1-Critical, P2-High, P3-Medium, P4-Low]\n'
+    '    - "reason": brief justification\n'
+    '- "entities": an object with\n'
+    '    - "customer_name": if mentioned\n'
+    '    - "order_id": any order/reference numbers\n'
+    '    - "product": product or service mentioned\n'
+    '    - "dates": any dates mentioned\n'
+    '    - "contact_info": email/phone if present\n'
+    '    - "issue_keywords": list of key issue terms\n'
+    "  Use null for entity fields not found.\n"
+    '- "response": an object with\n'
+    '    - "response": a helpful, empathetic customer-facing reply\n'
+    '    - "internal_note": note for the support team\n'
+    '    - "escalation_needed": true/false (true if priority is P1-Critical or P2-High)\n'
+    "Return ONLY valid JSON."
+)
+
+SINGLE_SHOT_SECTIONS = {
+    "analysis": ("analyze_ticket", ("intent", "sentiment", "urgency", "summary")),
+    "classification": ("classify_ticket", ("department", "priority", "reason")),
+    "entities": (
+        "extract_entities",
+        ("customer_name", "order_id", "product", "dates", "contact_info", "issue_keywords"),
+    ),
+    "response": ("generate_response", ("response", "internal_note", "escalation_needed")),
+}
+
+
+def _split_single_shot(reply: str) -> dict:
+    """Parse a combined reply and split it into per-tool JSON results.
+
+    Also used as the cache validator for the single-shot call, so a
+    malformed or truncated reply is never stored.
+
+    Args:
+        reply: Raw text returned for ``SINGLE_SHOT_SYSTEM``.
+
+    Returns:
+        Mapping of tool name to its JSON-string result.
+
+    Raises:
+        ValueError: If the reply is not valid JSON, or is missing a
+                    section or a required field.
+    """
+    combined = json.loads(reply)
+
+    results = {}
+    for section, (tool_name, fields) in SINGLE_SHOT_SECTIONS.items():
+        value = combined.get(section) if isinstance(combined, dict) else None
+        if not isinstance(value, dict) or not all(field in value for field in fields):
+            raise ValueError(f"Single-shot reply has an invalid {section!r} section")
+        results[tool_name] = json.dumps(value)
+    return results
+
+
+async def process_ticket_single_shot(ticket_text: str) -> dict:
+    """Run the whole pipeline as a single JSON-mode LLM call.
+
+    Pays one prompt-processing and network round-trip per ticket
+    instead of four.  The combined reply is split back into the
+    per-tool results so callers see the same shape as the multi-step
+    pipeline.
+
+    Args:
+        ticket_text: The raw text of the support ticket to process.
+
+    Returns:
+        The same dictionary shape as ``process_ticket_async()``.
+
+    Raises:
+        ValueError: If the combined reply is malformed or missing a
+                    section or a required field, or Groq rejected it
+                    as invalid JSON (``json_validate_failed``, e.g. when
+                    it was cut off at ``max_tokens``).  Such replies are
+                    not cached, so the next attempt asks the LLM again.
+    """
+    try:
+        reply = await _allm(
+            SINGLE_SHOT_SYSTEM,
+            ticket_text,
+            max_tokens=2048,
+            json_mode=True,
+            validate=_split_single_shot,
+        )
+    except BadRequestError as exc:
+        # JSON mode reports a generation that is not valid JSON as a 400
+        # rather than returning it.
+        if _error_code(exc) != "json_validate_failed":
+            raise
+        raise ValueError("Single-shot reply failed Groq's JSON validation") from exc
+    results = _split_single_shot(reply)
+    results["final_summary"] = _build_summary(results)
+    return results
+
 
 # ──────────────────────────────────────────────────────────────
 # Utilities
@@ -357,16 +706,43 @@ def _safe_json(text: str) -> str:
         return text
 
 
+def _error_code(exc: BadRequestError) -> str:
+    """Return the ``error.code`` of a Groq error response, or ``""``.
+
+    Args:
+        exc: An error raised by the Groq SDK for a 4xx response.
+
+    Returns:
+        The machine-readable error code, e.g. ``"json_validate_failed"``.
+    """
+    body = exc.body if isinstance(exc.body, dict) else {}
+    error = body.get("error", body)
+    return (error.get("code") if isinstance(error, dict) else None) or ""
+
+
+def _build_summary(results: dict) -> str:
+    """Concatenate the per-step JSON results into a plain-text summary.
+
+    Replaces the closing LLM call of the agent loop: every step already
+    returns structured JSON, so the summary is assembled locally.
+
+    Args:
+        results: Mapping of tool name to its JSON-string result.
+
+    Returns:
+        One labelled block per step, in pipeline order.
+    """
+    return "\n\n".join(
+        f"{name}:\n{results[name]}" for name in TOOL_MAP if name in results
+    )
+
+
 # ──────────────────────────────────────────────────────────────
 # Main Agent Loop
 # ──────────────────────────────────────────────────────────────
 
-def process_ticket(ticket_text: str) -> dict:
-    """Process a customer support ticket through the full agent pipeline.
-
-    This is the **main entry point** of the module.  It starts a
-    conversation with the Groq LLM, which autonomously decides which
-    tool to invoke at each step using the function-calling API.
+async def _run_agent_loop(ticket_text: str) -> dict:
+    """Process a ticket by letting the LLM choose each tool call.
 
     Workflow:
         1. The LLM receives the ticket and the ``AGENT_SYSTEM`` prompt.
@@ -377,31 +753,26 @@ def process_ticket(ticket_text: str) -> dict:
         5. After all four tools have been called (or ``max_iterations``
            is reached), the LLM returns a natural-language summary.
 
+    This costs one planning round-trip per tool on top of the tool
+    calls themselves, so it only runs when ``use_planner`` is set.
+
     Args:
         ticket_text: The raw text of the support ticket to process.
 
     Returns:
-        A dictionary whose keys are the tool names that were called
-        (``analyze_ticket``, ``classify_ticket``, ``extract_entities``,
-        ``generate_response``) mapped to their JSON-string results,
-        plus a ``final_summary`` key with the LLM's closing summary.
-
-    Example::
-
-        results = process_ticket("I need a refund for order #456.")
-        print(json.loads(results["classify_ticket"]))
-        # {'department': 'Billing', 'priority': 'P3-Medium', ...}
+        The same dictionary shape as ``process_ticket_async()``, with
+        ``final_summary`` written by the LLM.
     """
-    messages = [
-        {"role": "system", "content": AGENT_SYSTEM},
-        {"role": "user", "content": f"Process this support ticket:\n\n{ticket_text}"},
-    ]
+    messages = list(_BASE_MESSAGES)
+    messages.append(
+        {"role": "user", "content": f"Process this support ticket:\n\n{ticket_text}"}
+    )
 
     results = {}  # Accumulates outputs from each tool call
     max_iterations = 10  # Safety cap to prevent infinite loops
 
     for _ in range(max_iterations):
-        response = client.chat.completions.create(
+        response = await _create_completion(
             model=MODEL_NAME,
             messages=messages,
             tools=TOOLS,
@@ -431,7 +802,7 @@ def process_ticket(ticket_text: str) -> dict:
             if fn is None:
                 tool_result = json.dumps({"error": f"Unknown tool: {fn_name}"})
             else:
-                tool_result = fn(**args)
+                tool_result = await fn(**args)
 
             # Store the result keyed by tool name for easy access.
             results[fn_name] = tool_result
@@ -447,3 +818,109 @@ def process_ticket(ticket_text: str) -> dict:
             )
 
     return results
+
+
+async def process_ticket_direct(ticket_text: str) -> dict:
+    """Run the four tools as a fixed dependency graph, without a planner.
+
+    The pipeline order never changes, so asking the LLM which tool to
+    call next is pure overhead.  Only three LLM round-trips sit on the
+    critical path::
+
+        analyze_ticket ─┬─► classify_ticket ─┐
+        extract_entities ┴───────────────────┴─► generate_response
+
+    Args:
+        ticket_text: The raw text of the support ticket to process.
+
+    Returns:
+        The same dictionary shape as ``process_ticket_async()``.
+
+    Raises:
+        ValueError: If a step's LLM reply is not a JSON object.
+    """
+    # Analysis and entity extraction only need the raw ticket.
+    analysis, entities = await asyncio.gather(
+        analyze_ticket(ticket_text), extract_entities(ticket_text)
+    )
+    classification = await classify_ticket(ticket_text, analysis)
+    response = await generate_response(ticket_text, analysis, classification, entities)
+
+    results = {
+        "analyze_ticket": analysis,
+        "classify_ticket": classification,
+        "extract_entities": entities,
+        "generate_response": response,
+    }
+    results["final_summary"] = _build_summary(results)
+    return results
+
+
+@async_lru_cache(maxsize=1024)
+async def process_ticket_async(
+    ticket_text: str, use_planner: bool = USE_LLM_PLANNER
+) -> dict:
+    """Process a customer support ticket through the full pipeline.
+
+    This is the **main entry point** of the module.  When
+    ``USE_SINGLE_SHOT`` is enabled the ticket is first processed with one
+    combined LLM call (``process_ticket_single_shot()``).  If that reply
+    fails validation (ours or Groq's), or single-shot mode is off, the
+    four tools are run directly in dependency order
+    (``process_ticket_direct()``).
+
+    Args:
+        ticket_text: The raw text of the support ticket to process.
+        use_planner: If ``True``, use the LLM-driven agent loop
+                     (``_run_agent_loop()``) instead.  Defaults to
+                     ``USE_LLM_PLANNER``.
+
+    Returns:
+        A dictionary whose keys are the tool names
+        (``analyze_ticket``, ``classify_ticket``, ``extract_entities``,
+        ``generate_response``) mapped to their JSON-string results,
+        plus a ``final_summary`` key summarising every step.
+
+    Must be awaited inside ``groq_session()``.  At most
+    ``MAX_CONCURRENCY`` tickets are processed at once, so callers can
+    ``asyncio.gather`` an arbitrarily large batch.  Results are
+    memoised on the ticket text, so re-submitting a ticket is free.
+
+    Example::
+
+        async with groq_session():
+            results = await process_ticket_async("I need a refund for order #456.")
+        print(json.loads(results["classify_ticket"]))
+        # {'department': 'Billing', 'priority': 'P3-Medium', ...}
+    """
+    async with _get_semaphore():
+        if use_planner:
+            return await _run_agent_loop(ticket_text)
+
+        if USE_SINGLE_SHOT:
+            try:
+                return await process_ticket_single_shot(ticket_text)
+            except ValueError:
+                pass  # Invalid combined reply — fall back to one call per step.
+
+        return await process_ticket_direct(ticket_text)
+
+
+def process_ticket(ticket_text: str, use_planner: bool = USE_LLM_PLANNER) -> dict:
+    """Synchronous wrapper around ``process_ticket_async()``.
+
+    Opens and closes its own ``groq_session()`` on a fresh event loop.
+
+    Args:
+        ticket_text: The raw text of the support ticket to process.
+        use_planner: Use the LLM-driven agent loop instead of the
+                     fixed pipeline.  Defaults to ``USE_LLM_PLANNER``.
+
+    Returns:
+        See ``process_ticket_async()``.
+    """
+    async def run() -> dict:
+        async with groq_session():
+            return await process_ticket_async(ticket_text, use_planner)
+
+    return asyncio.run(run())
@@ -0,0 +1,428 @@
+"""
+cache.py — Semantic LLM Response Cache
+=======================================
+
+Caches Groq responses so that repeated or paraphrased tickets (e.g.
+"charged twice" vs. "double-billed") skip the LLM round-trip entirely.
+
+Lookup order:
+    1. **Exact match**    → ``sha256(system + user)`` in a plain dict.
+    2. **Semantic match** → Only for calls that opt in with
+       ``semantic=True``.  The ``user`` text is embedded with a local
+       SentenceTransformer model and searched against earlier prompts
+       that used the *same* system prompt.  Embeddings are
+       L2-normalised, quantised to int8 with a per-vector scale and
+       stacked into one matrix per system prompt, so a single
+       ``matrix @ query`` yields the (approximate) cosine similarity to
+       every stored prompt.  A hit at or above
+       ``CACHE_SIMILARITY_THRESHOLD`` returns the stored response.
+
+Only prompts whose replies are free of ticket-specific details should
+opt in: two tickets that differ only in customer name, order number or
+amount are near-identical to the embedding model, and a reused reply
+names the first customer's details.  In ``agent.py`` the analysis and
+classification steps opt in only with ``AGENT_SEMANTIC_CACHE=1``.
+
+Embedding runs in a worker thread so concurrent tickets are not
+stalled by the model.  The exact layer keeps the ``CACHE_MAX_ENTRIES``
+most recently used responses.  Both layers are pickled to
+``CACHE_PATH`` at interpreter exit so the cache survives between runs.
+
+``async_lru_cache`` adds an in-process memo on top, keyed on a
+function's arguments, so repeated tool calls skip even the hashing and
+embedding work.  Setting ``AGENT_DISABLE_CACHE=1`` turns both off.
+
+``sentence-transformers`` (and therefore NumPy) is optional: when it
+is missing only the exact-match layer is active.
+
+Usage:
+    >>> from cache import llm_cache
+    >>> @llm_cache.cached
+    ... async def _allm(system: str, user: str) -> str:
+    ...     ...
+    >>> await _allm(ANALYZE_SYS, ticket_text, semantic=True)
+"""
+
+import asyncio
+import atexit
+import collections
+import copy
+import functools
+import hashlib
+import os
+import pickle
+import threading
+from typing import Callable, Optional
+
+from config import (
+    CACHE_ENABLED,
+    CACHE_MAX_ENTRIES,
+    CACHE_PATH,
+    CACHE_SIMILARITY_THRESHOLD,
+    EMBEDDING_MODEL_NAME,
+)
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+
+# Bumped whenever saved semantic entries must not be reused.  Version 1
+# indexed every prompt, including replies that carry customer details.
+_FORMAT_VERSION = 2
+
+# Rows dequantised at a time by ``_EmbeddingMatrix.search``.  A
+# 256 x 384 float32 block (384 KiB) stays in L2 cache, so a lookup
+# streams the int8 rows once instead of materialising a full float32
+# copy of the matrix.
+_SEARCH_CHUNK_ROWS = 256
+
+
+def _digest(*parts: str) -> str:
+    """Return a stable SHA-256 hex digest of the given strings."""
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+class _EmbeddingMatrix:
+    """Growable ``(N, d)`` int8-quantised matrix of L2-normalised embeddings.
+
+    Each row is stored as ``int8`` with its own float32 scale
+    (``max(|v|) / 127``), a quarter of the float32 footprint.  Rows
+    live in one preallocated array whose capacity doubles when full,
+    so appends are amortised O(d) and a lookup is a single
+    matrix-vector product instead of a Python loop over entries.
+
+    Args:
+        dim: Embedding dimensionality (384 for MiniLM).
+    """
+
+    def __init__(self, dim: int, capacity: int = 64):
+        self._data = np.empty((capacity, dim), dtype=np.int8)
+        self._scales = np.empty(capacity, dtype=np.float32)
+        self.size = 0
+
+    def add(self, vector):
+        """Quantise one ``(d,)`` embedding and append it as a new row."""
+        if self.size == len(self._data):
+            capacity = 2 * len(self._data)
+            data = np.empty((capacity, self._data.shape[1]), dtype=np.int8)
+            scales = np.empty(capacity, dtype=np.float32)
+            data[: self.size] = self._data
+            scales[: self.size] = self._scales
+            self._data, self._scales = data, scales
+
+        scale = float(np.abs(vector).max()) / 127 or 1.0
+        self._data[self.size] = np.round(vector / scale).astype(np.int8)
+        self._scales[self.size] = scale
+        self.size += 1
+
+    def search(self, query) -> tuple:
+        """Return ``(similarity, row)`` of the row closest to ``query``.
+
+        The query stays in float32; each row's dot product is rescaled
+        by that row's quantisation scale.  Rows are converted to float32
+        ``_SEARCH_CHUNK_ROWS`` at a time into one reused buffer.
+        """
+        n = self.size
+        block = np.empty((min(n, _SEARCH_CHUNK_ROWS), self._data.shape[1]), dtype=np.float32)
+        sims = np.empty(n, dtype=np.float32)
+        for start in range(0, n, _SEARCH_CHUNK_ROWS):
+            stop = min(start + _SEARCH_CHUNK_ROWS, n)
+            rows = block[: stop - start]
+            np.copyto(rows, self._data[start:stop])
+            np.matmul(rows, query, out=sims[start:stop])
+        sims *= self._scales[:n]
+        row = int(np.argmax(sims))
+        return float(sims[row]), row
+
+    def rows(self):
+        """Return the stored embeddings, dequantised to an ``(N, d)`` float32 array."""
+        n = self.size
+        return self._data[:n].astype(np.float32) * self._scales[:n, None]
+
+
+class SemanticCache:
+    """Two-level (exact + semantic) cache of LLM responses.
+
+    Semantic entries are partitioned by a digest of the system prompt,
+    so an analysis prompt can never be answered with a cached
+    classification.
+
+    Args:
+        path:        Pickle file used to persist the cache between runs.
+        threshold:   Minimum cosine similarity for a semantic hit.
+        model_name:  SentenceTransformer model used for embeddings.
+        max_entries: Exact-match responses kept; the least recently
+                     used one is evicted first.
+    """
+
+    def __init__(
+        self, path: str, threshold: float, model_name: str, max_entries: int = 10_000
+    ):
+        self.path = path
+        self.threshold = threshold
+        self.model_name = model_name
+        self.max_entries = max_entries
+
+        self._model = None
+        self._model_lock = threading.Lock()  # Embeddings run in worker threads.
+        self._exact = collections.OrderedDict()  # sha256(system + user) → response
+        self._matrices = {}    # sha256(system) → _EmbeddingMatrix
+        self._responses = {}   # sha256(system) → responses, parallel to matrix rows
+        self._dirty = False
+
+        # Remember recent vectors so a prompt that is re-sent (e.g.
+        # after its reply failed validation) is not embedded again.
+        self._embed = functools.lru_cache(maxsize=256)(self._encode)
+
+        self.load()
+
+    @property
+    def semantic_enabled(self) -> bool:
+        """Whether the embedding dependencies are installed."""
+        return SentenceTransformer is not None
+
+    # ──────────────────────────────────────────────────────────
+    # Embeddings
+    # ──────────────────────────────────────────────────────────
+
+    def _get_model(self):
+        """Load the SentenceTransformer model on first use."""
+        with self._model_lock:
+            if self._model is None:
+                self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def warmup(self):
+        """Load the embedding model now rather than on the first lookup."""
+        if self.semantic_enabled:
+            self._encode("warmup")
+
+    def _encode(self, text: str):
+        """Embed ``text`` as a ``(d,)`` L2-normalised float32 array."""
+        vector = self._get_model().encode(
+            text, normalize_embeddings=True, convert_to_numpy=True
+        )
+        return vector.astype(np.float32)
+
+    def _add_vector(self, key: str, vector, response: str):
+        """Append one embedding/response pair to the ``key`` partition."""
+        matrix = self._matrices.get(key)
+        if matrix is None:
+            matrix = self._matrices[key] = _EmbeddingMatrix(vector.shape[0])
+            self._responses[key] = []
+        matrix.add(vector)
+        self._responses[key].append(response)
+
+    # ──────────────────────────────────────────────────────────
+    # Lookup / insert
+    # ──────────────────────────────────────────────────────────
+
+    async def embed(self, text: str):
+        """Embed ``text`` in a worker thread, keeping the event loop free."""
+        return await asyncio.to_thread(self._embed, text)
+
+    def get(self, system: str, user: str, vector=None) -> Optional[str]:
+        """Return a cached response for this prompt pair, or ``None``.
+
+        Args:
+            system: The system prompt sent to the LLM.
+            user:   The user message sent to the LLM.
+            vector: Embedding of ``user`` from ``embed()``.  When given,
+                    a near-identical earlier ``user`` text also matches;
+                    otherwise only exact matches are returned.
+
+        Returns:
+            The cached response text on an exact or semantic hit,
+            otherwise ``None``.
+        """
+        digest = _digest(system, user)
+        response = self._exact.get(digest)
+        if response is not None:
+            self._exact.move_to_end(digest)
+            return response
+        if vector is None:
+            return None
+
+        key = _digest(system)
+        matrix = self._matrices.get(key)
+        if matrix is None:
+            return None
+
+        similarity, row = matrix.search(vector)
+        if similarity >= self.threshold:
+            return self._responses[key][row]
+        return None
+
+    def put(self, system: str, user: str, response: str, vector=None):
+        """Store ``response`` for this prompt pair.
+
+        Args:
+            system:   The system prompt sent to the LLM.
+            user:     The user message sent to the LLM.
+            response: The LLM's response text.
+            vector:   Embedding of ``user`` from ``embed()``; when
+                      given, ``user`` is also indexed for similarity
+                      lookups.
+        """
+        digest = _digest(system, user)
+        self._exact[digest] = response
+        self._exact.move_to_end(digest)
+        while len(self._exact) > self.max_entries:
+            self._exact.popitem(last=False)
+        if vector is not None:
+            self._add_vector(_digest(system), vector, response)
+        self._dirty = True
+
+    def cached(self, fn):
+        """Decorate an async ``fn(system, user, **kwargs) -> str`` with this cache.
+
+        The wrapper takes two extra keyword-only arguments, neither of
+        which is passed on to ``fn``:
+
+            - ``semantic``: Enable the similarity layer for this call
+              (default ``False``).
+            - ``validate``: Callable that raises ``ValueError`` for an
+              unusable response.  Rejected fresh responses propagate the
+              error without being cached; rejected cached responses are
+              treated as a miss.
+        """
+
+        @functools.wraps(fn)
+        async def wrapper(
+            system: str,
+            user: str,
+            *,
+            semantic: bool = False,
+            validate: Optional[Callable[[str], object]] = None,
+            **kwargs,
+        ) -> str:
+            if not CACHE_ENABLED:
+                return await fn(system, user, **kwargs)
+
+            semantic = semantic and self.semantic_enabled
+            vector = None
+            response = self.get(system, user)
+            if response is None and semantic:
+                vector = await self.embed(user)
+                response = self.get(system, user, vector)
+            if response is not None and validate is not None:
+                try:
+                    validate(response)
+                except ValueError:
+                    response = None  # Stored before validation existed.
+
+            if response is None:
+                response = await fn(system, user, **kwargs)
+                if validate is not None:
+                    validate(response)
+                if semantic and vector is None:
+                    vector = await self.embed(user)
+                self.put(system, user, response, vector)
+            return response
+
+        return wrapper
+
+    # ──────────────────────────────────────────────────────────
+    # Persistence
+    # ──────────────────────────────────────────────────────────
+
+    def load(self):
+        """Load a previously saved cache from ``self.path`` if it exists.
+
+        Semantic entries are discarded when they were produced by a
+        different embedding model, since the vectors are not comparable,
+        or by an older cache format.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            state = pickle.load(f)
+
+        self._exact = collections.OrderedDict(state["exact"])
+        while len(self._exact) > self.max_entries:
+            self._exact.popitem(last=False)
+        if (
+            not self.semantic_enabled
+            or state.get("version") != _FORMAT_VERSION
+            or state["model_name"] != self.model_name
+        ):
+            # Dropped entries must not be written back by ``save()``.
+            self._dirty = bool(state["semantic"])
+            return
+        for key, (vectors, responses) in state["semantic"].items():
+            for vector, response in zip(vectors, responses):
+                self._add_vector(key, vector, response)
+
+    def save(self):
+        """Persist the cache to ``self.path`` if it changed since loading."""
+        if not self._dirty:
+            return
+        state = {
+            "version": _FORMAT_VERSION,
+            "model_name": self.model_name,
+            "exact": self._exact,
+            "semantic": {
+                key: (matrix.rows(), self._responses[key])
+                for key, matrix in self._matrices.items()
+            },
+        }
+        # Write to a temporary file first so a crash never leaves a
+        # truncated cache behind.
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+def async_lru_cache(maxsize: int = 1024):
+    """``functools.lru_cache`` for async functions.
+
+    ``lru_cache`` cannot wrap a coroutine function directly: it would
+    cache the coroutine object, which can only be awaited once.  This
+    caches the awaited *result* instead.  Results are shallow-copied on
+    the way out so callers may mutate returned dicts freely.
+
+    Args:
+        maxsize: Maximum number of results kept; the least recently
+                 used entry is evicted first.
+
+    Returns:
+        A decorator for async functions with hashable arguments.
+    """
+
+    def decorator(fn):
+        results = collections.OrderedDict()
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            if not CACHE_ENABLED:
+                return await fn(*args, **kwargs)
+
+            key = (args, tuple(sorted(kwargs.items())))
+            if key in results:
+                results.move_to_end(key)
+                return copy.copy(results[key])
+
+            result = await fn(*args, **kwargs)
+            results[key] = result
+            if len(results) > maxsize:
+                results.popitem(last=False)
+            return copy.copy(result)
+
+        wrapper.cache_clear = results.clear
+        return wrapper
+
+    return decorator
+
+
+# ──────────────────────────────────────────────────────────────
+# Shared cache instance
+# ──────────────────────────────────────────────────────────────
+llm_cache = SemanticCache(
+    CACHE_PATH, CACHE_SIMILARITY_THRESHOLD, EMBEDDING_MODEL_NAME, CACHE_MAX_ENTRIES
+)
+atexit.register(llm_cache.save)
@@ -15,6 +15,71 @@ Constants:
     MODEL_NAME : str
         The Groq-hosted LLM model identifier used for all inference
         calls.  Default: ``llama-3.1-8b-instant``.
+
+    MAX_RETRIES : int
+        Retries the Groq SDK makes itself for transient errors
+        (connection failures, 5xx, 429), honouring ``Retry-After``.
+        Default: ``5``.
+
+    RATE_LIMIT_RETRIES / RATE_LIMIT_BACKOFF : int / float
+        Extra rounds ``agent.py`` makes when a request is still
+        rate-limited after the SDK's retries, waiting
+        ``RATE_LIMIT_BACKOFF * 2**round`` seconds before each.  A
+        request therefore makes at most
+        ``(RATE_LIMIT_RETRIES + 1) * (MAX_RETRIES + 1)`` = 18 HTTP
+        attempts.  Defaults: ``2`` / ``10.0``.
+
+    REQUEST_TIMEOUT / CONNECT_TIMEOUT : float
+        Seconds allowed for a whole request / for opening a connection.
+        Defaults: ``30.0`` / ``5.0``.
+
+    MAX_CONCURRENCY : int
+        Maximum number of tickets processed concurrently.  Keeps batch
+        runs within Groq's request and token rate limits.  Override
+        with the ``AGENT_MAX_CONCURRENCY`` environment variable.
+        Default: ``4``.
+
+    USE_SINGLE_SHOT : bool
+        Process each ticket with one combined LLM call, falling back to
+        one call per step if the combined output is malformed.  Disable
+        with ``AGENT_SINGLE_SHOT=0``.  Default: ``True``.
+
+    USE_LLM_PLANNER : bool
+        Let the LLM choose each tool call (the original agent loop)
+        instead of running the fixed pipeline.  Costs one extra
+        round-trip per step.  Enable with ``AGENT_USE_LLM_PLANNER=1``.
+        Default: ``False``.
+
+    CACHE_ENABLED : bool
+        Whether LLM responses and tool results are cached.  Set
+        ``AGENT_DISABLE_CACHE=1`` to turn all caching off, e.g. for
+        benchmarking.  Default: ``True``.
+
+    CACHE_PATH : str
+        Pickle file backing the LLM response cache.  Override with the
+        ``AGENT_CACHE_PATH`` environment variable.
+        Default: ``.llm_cache.pkl``.
+
+    CACHE_MAX_ENTRIES : int
+        Maximum number of exact-match LLM responses kept (and saved to
+        ``CACHE_PATH``); the least recently used are evicted first.
+        Default: ``10000``.
+
+    SEMANTIC_CACHE_ENABLED : bool
+        Let the analysis and classification steps reuse the reply of a
+        near-identical earlier ticket.  Their ``summary`` and ``reason``
+        fields usually name the customer, order or amount, so a reused
+        reply can carry another ticket's details into the customer
+        reply.  Only enable for tickets without such details, with
+        ``AGENT_SEMANTIC_CACHE=1``.  Default: ``False``.
+
+    CACHE_SIMILARITY_THRESHOLD : float
+        Minimum cosine similarity for a semantic cache hit.
+        Default: ``0.95``.
+
+    EMBEDDING_MODEL_NAME : str
+        SentenceTransformer model used to embed prompts for the
+        semantic cache.  Default: ``all-MiniLM-L6-v2``.
 """
 
 import os
@@ -27,3 +92,27 @@ GROQ_API_KEY = os.environ.get("GROQ_API_KEY", "")
 # The LLM model to use for all Groq API calls.
 # See https://console.groq.com/docs/models for available models.
 MODEL_NAME = "llama-3.1-8b-instant"
+
+# Groq client resilience settings.
+MAX_RETRIES = 5
+RATE_LIMIT_RETRIES = 2
+RATE_LIMIT_BACKOFF = 10.0
+REQUEST_TIMEOUT = 30.0
+CONNECT_TIMEOUT = 5.0
+
+# Upper bound on tickets processed at the same time when batching.
+MAX_CONCURRENCY = int(os.environ.get("AGENT_MAX_CONCURRENCY", "4"))
+
+# Fuse the four pipeline steps into a single LLM call per ticket.
+USE_SINGLE_SHOT = os.environ.get("AGENT_SINGLE_SHOT", "1") != "0"
+
+# Route tickets through the LLM tool-calling planner (slow; for comparison).
+USE_LLM_PLANNER = os.environ.get("AGENT_USE_LLM_PLANNER", "0") == "1"
+
+# LLM response and tool-result caches (see cache.py).
+CACHE_ENABLED = os.environ.get("AGENT_DISABLE_CACHE", "0") != "1"
+CACHE_PATH = os.environ.get("AGENT_CACHE_PATH", ".llm_cache.pkl")
+CACHE_MAX_ENTRIES = 10_000
+SEMANTIC_CACHE_ENABLED = os.environ.get("AGENT_SEMANTIC_CACHE", "0") == "1"
+CACHE_SIMILARITY_THRESHOLD = 0.95
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
@@ -9,8 +9,9 @@ support tickets that cover different scenarios:
     - **TICKET-002**: Critical outage (production server down).
     - **TICKET-003**: Sales inquiry (bulk educational licensing).
 
-For each ticket the full 4-step pipeline is executed and the results
-are pretty-printed to the console:
+All tickets are processed concurrently and the results of each full
+4-step pipeline are pretty-printed to the console as soon as that
+ticket finishes:
 
     1. Analysis   — intent, sentiment, urgency, summary.
     2. Classification — department, priority, reason.
@@ -23,10 +24,12 @@ Usage::
     python main.py
 """
 
+import asyncio
 import json
-from agent import process_ticket, _safe_json
+from agent import groq_session, process_ticket_async, warmup, _safe_json
 
-{
+SAMPLE_TICKETS = [
+    {
         "id": "TICKET-001",
         "text": (
             "Hi, I'm John Smith (order #ORD-98432). I was charged twice for my "
@@ -68,32 +71,62 @@ def print_section(title: str, content: str):
     print(_safe_json(content))
 
 
-def main():
-    """Iterate over sample tickets, process each through the agent, and display results."""
-    for ticket in SAMPLE_TICKETS:
-        print(f"\n{'#'*60}")
-        print(f"  PROCESSING: {ticket['id']}")
-        print(f"{'#'*60}")
-        print(f"\nTicket Text:\n{ticket['text']}\n")
+def print_results(ticket: dict, results: dict):
+    """Print the ticket text followed by the output of every pipeline step.
+
+    Args:
+        ticket:  Sample ticket with ``id`` and ``text`` keys.
+        results: Dictionary returned by ``process_ticket_async()``, or
+                 an ``error`` entry if processing failed.
+    """
+    print(f"\n{'#'*60}")
+    print(f"  PROCESSING: {ticket['id']}")
+    print(f"{'#'*60}")
+    print(f"\nTicket Text:\n{ticket['text']}\n")
+
+    if "error" in results:
+        print_section("ERROR", results["error"])
+    if "analyze_ticket" in results:
+        print_section("1. ANALYSIS", results["analyze_ticket"])
+    if "classify_ticket" in results:
+        print_section("2. CLASSIFICATION", results["classify_ticket"])
+    if "extract_entities" in results:
+        print_section("3. EXTRACTED ENTITIES", results["extract_entities"])
+    if "generate_response" in results:
+        print_section("4. GENERATED RESPONSE", results["generate_response"])
+    if "final_summary" in results:
+        print(f"\n{'='*60}")
+        print("  AGENT SUMMARY")
+        print(f"{'='*60}")
+        print(results["final_summary"])
+
+    print(f"\n{'#'*60}\n")
+
+
+async def process_sample(ticket: dict) -> tuple:
+    """Process one sample ticket, returning it alongside its results.
+
+    A failure (e.g. a ``RateLimitError`` after all retries) is returned
+    as an ``error`` entry instead of raised, so one bad ticket does not
+    stop the others from being printed.
+    """
+    try:
+        results = await process_ticket_async(ticket["text"])
+    except Exception as exc:
+        results = {"error": f"{type(exc).__name__}: {exc}"}
+    return ticket, results
 
-        results = process_ticket(ticket["text"])
 
-        if "analyze_ticket" in results:
-            print_section("1. ANALYSIS", results["analyze_ticket"])
-        if "classify_ticket" in results:
-            print_section("2. CLASSIFICATION", results["classify_ticket"])
-        if "extract_entities" in results:
-            print_section("3. EXTRACTED ENTITIES", results["extract_entities"])
-        if "generate_response" in results:
-            print_section("4. GENERATED RESPONSE", results["generate_response"])
-        if "final_summary" in results:
-            print(f"\n{'='*60}")
-            print("  AGENT SUMMARY")
-            print(f"{'='*60}")
-            print(results["final_summary"])
+async def main():
+    """Process all sample tickets concurrently, printing each as it completes."""
+    async with groq_session():
+        await warmup()
 
-        print(f"\n{'#'*60}\n")
+        tasks = [process_sample(ticket) for ticket in SAMPLE_TICKETS]
+        for next_done in asyncio.as_completed(tasks):
+            ticket, results = await next_done
+            print_results(ticket, results)
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+"""
+parsing.py — Local Text Parsing Helpers
+========================================
+
+Pure, dependency-free helpers used by ``agent.py`` to avoid or shorten
+LLM round-trips:
+
+    - ``regex_entities()``  → Matches order IDs, dates, emails and phone
+      numbers in a ticket with precompiled regular expressions.
+    - ``json_object_end()`` → Finds where the first top-level JSON
+      object in a (possibly partial) streamed reply closes.
+"""
+
+import re
+
+# ──────────────────────────────────────────────────────────────
+# Entity Patterns
+# ──────────────────────────────────────────────────────────────
+# Order IDs, dates, emails and phone numbers are regular enough
+# to match locally, which saves an LLM round-trip per ticket.
+# ``_PHONE`` only finds candidates; ``_is_phone`` decides.
+# ──────────────────────────────────────────────────────────────
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]*\w")
+_PHONE = re.compile(r"\+?\d[\d\s().-]{5,}\d")
+_ORDER = re.compile(r"\b(?:ORD|ENT|REF)-?\d+\b", re.I)
+_DATE = re.compile(
+    r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?"
+    r"\s+\d{1,2}(?:st|nd|rd|th)?[,\s]+\d{4}\b"
+    r"|\b\d{4}-\d{2}-\d{2}\b"
+)
+_NON_DIGIT = re.compile(r"\D")
+
+
+def _luhn_valid(digits: str) -> bool:
+    """Return ``True`` if ``digits`` passes the Luhn (mod 10) checksum."""
+    total = 0
+    for i, ch in enumerate(reversed(digits)):
+        d = int(ch)
+        if i % 2:
+            d = d * 2 - 9 if d > 4 else d * 2
+        total += d
+    return total % 10 == 0
+
+
+def _is_phone(candidate: str) -> bool:
+    """Decide whether a ``_PHONE`` match is plausibly a phone number.
+
+    Phone numbers have 7–15 digits (E.164).  Payment card numbers have
+    13–19, so anything in the overlap that passes the Luhn checksum is
+    treated as a card and rejected — it must never be surfaced as
+    contact information.
+    """
+    digits = _NON_DIGIT.sub("", candidate)
+    if not 7 <= len(digits) <= 15:
+        return False
+    return not (len(digits) >= 13 and _luhn_valid(digits))
+
+
+def regex_entities(ticket_text: str) -> dict:
+    """Match order IDs, dates and contact details with ``re``.
+
+    Args:
+        ticket_text: The raw customer support ticket string.
+
+    Returns:
+        The ``extract_entities()`` schema.  Fields that need language
+        understanding (``customer_name``, ``product``,
+        ``issue_keywords``) are always ``None``; the others are
+        de-duplicated lists, or ``None`` when nothing matched.
+    """
+    order_ids = _ORDER.findall(ticket_text)
+    dates = _DATE.findall(ticket_text)
+    # Long order numbers and ISO dates also look like phone numbers.
+    phones = [
+        phone.strip()
+        for phone in _PHONE.findall(ticket_text)
+        if _is_phone(phone) and not any(phone in other for other in order_ids + dates)
+    ]
+    contact_info = _EMAIL.findall(ticket_text) + phones
+
+    return {
+        "customer_name": None,
+        "order_id": list(dict.fromkeys(order_ids)) or None,
+        "product": None,
+        "dates": list(dict.fromkeys(dates)) or None,
+        "contact_info": list(dict.fromkeys(contact_info)) or None,
+        "issue_keywords": None,
+    }
+
+
+def json_object_end(text: str) -> int:
+    """Return the index just past the first complete top-level JSON object.
+
+    Tracks ``{``/``}`` nesting depth, ignoring braces inside string
+    literals, so a streamed reply can be cut off as soon as the object
+    closes.
+
+    Args:
+        text: The reply received so far.
+
+    Returns:
+        The end index of the object, or ``-1`` if it is not yet closed.
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return -1
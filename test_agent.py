@@ -0,0 +1,162 @@
+"""
+test_agent.py — Unit tests for agent.py
+========================================
+
+Groq is replaced by an ``httpx.MockTransport``, so no API key or
+network access is needed.  Run with::
+
+    python -m unittest test_agent
+"""
+
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+import httpx
+from groq import AsyncGroq, BadRequestError
+
+import agent
+
+
+def _mock_client(handler) -> AsyncGroq:
+    """Return an ``AsyncGroq`` client whose requests are answered by ``handler``."""
+    return AsyncGroq(
+        api_key="test",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+def _error_handler(code: str):
+    """Return a transport handler that fails every request with a 400 ``code``."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            400,
+            json={
+                "error": {
+                    "message": "Failed to generate JSON.",
+                    "type": "invalid_request_error",
+                    "code": code,
+                    "failed_generation": '{"analysis": {"intent": "ref',
+                }
+            },
+        )
+
+    return handler
+
+
+def _single_shot_reply(**overrides) -> dict:
+    """Return a well-formed combined reply, with sections replaced by ``overrides``."""
+    reply = {
+        section: {field: None for field in fields}
+        for section, (_, fields) in agent.SINGLE_SHOT_SECTIONS.items()
+    }
+    reply.update(overrides)
+    return reply
+
+
+class SplitSingleShotTest(unittest.TestCase):
+    def test_valid_reply_is_split_per_tool(self):
+        reply = _single_shot_reply()
+        reply["classification"]["department"] = "Billing"
+
+        results = agent._split_single_shot(json.dumps(reply))
+
+        self.assertEqual(set(results), set(agent.TOOL_MAP))
+        self.assertEqual(json.loads(results["classify_ticket"])["department"], "Billing")
+
+    def test_invalid_json_is_rejected(self):
+        with self.assertRaises(ValueError):
+            agent._split_single_shot('{"analysis": {"intent": "ref')
+
+    def test_non_object_is_rejected(self):
+        with self.assertRaises(ValueError):
+            agent._split_single_shot("[]")
+
+    def test_missing_section_is_rejected(self):
+        reply = _single_shot_reply()
+        del reply["entities"]
+        with self.assertRaisesRegex(ValueError, "entities"):
+            agent._split_single_shot(json.dumps(reply))
+
+    def test_missing_field_is_rejected(self):
+        reply = _single_shot_reply(response={"response": "Hi", "internal_note": ""})
+        with self.assertRaisesRegex(ValueError, "response"):
+            agent._split_single_shot(json.dumps(reply))
+
+    def test_non_object_section_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "analysis"):
+            agent._split_single_shot(json.dumps(_single_shot_reply(analysis="ok")))
+
+
+class RequireJsonObjectTest(unittest.TestCase):
+    def test_object_is_returned(self):
+        self.assertEqual(agent._require_json_object('{"a": 1}'), {"a": 1})
+
+    def test_truncated_or_non_object_replies_are_rejected(self):
+        for reply in ('{"a": ', "Sure! Here is the JSON", "[1, 2]", ""):
+            with self.subTest(reply=reply), self.assertRaises(ValueError):
+                agent._require_json_object(reply)
+
+
+class SingleShotFallbackTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        patcher = mock.patch("cache.CACHE_ENABLED", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.direct = mock.AsyncMock(return_value={"final_summary": "direct"})
+        patcher = mock.patch.object(agent, "process_ticket_direct", self.direct)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        agent._semaphore.set(asyncio.Semaphore(1))
+
+    async def _process(self, handler) -> dict:
+        async with _mock_client(handler) as aclient:
+            agent._aclient.set(aclient)
+            return await agent.process_ticket_async("hi", use_planner=False)
+
+    @mock.patch.object(agent, "USE_SINGLE_SHOT", True)
+    async def test_json_validate_failed_falls_back_to_direct(self):
+        results = await self._process(_error_handler("json_validate_failed"))
+        self.assertEqual(results, {"final_summary": "direct"})
+        self.direct.assert_awaited_once_with("hi")
+
+    @mock.patch.object(agent, "USE_SINGLE_SHOT", True)
+    async def test_other_bad_requests_are_raised(self):
+        with self.assertRaises(BadRequestError):
+            await self._process(_error_handler("model_not_found"))
+        self.direct.assert_not_awaited()
+
+    @mock.patch.object(agent, "USE_SINGLE_SHOT", True)
+    async def test_malformed_reply_falls_back_to_direct(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200,
+                json={
+                    "id": "1",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": agent.MODEL_NAME,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "finish_reason": "stop",
+                            "message": {
+                                "role": "assistant",
+                                "content": json.dumps({"analysis": {}}),
+                            },
+                        }
+                    ],
+                },
+            )
+
+        results = await self._process(handler)
+        self.assertEqual(results, {"final_summary": "direct"})
+
+
+if __name__ == "__main__":
+    unittest.main()
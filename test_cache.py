@@ -0,0 +1,285 @@
+"""
+test_cache.py — Unit tests for cache.py
+========================================
+
+The semantic layer is exercised with a small fake embedding model, so
+only NumPy is needed (those tests are skipped without it).  Run with::
+
+    python -m unittest test_cache
+"""
+
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+import cache
+from cache import SemanticCache, async_lru_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _unit(*components: float):
+    """Return ``components`` as an L2-normalised 4-d float32 vector."""
+    vector = np.zeros(4, dtype=np.float32)
+    vector[: len(components)] = components
+    return vector / np.linalg.norm(vector)
+
+
+class FakeModel:
+    """Stand-in for ``SentenceTransformer`` with hand-picked embeddings."""
+
+    def __init__(self, model_name: str):
+        self.vectors = {
+            "charged twice": _unit(1.0),
+            "double charged": _unit(1.0, 0.1),      # cosine ≈ 0.995
+            "server is down": _unit(0.0, 0.0, 1.0),  # cosine 0
+            "warmup": _unit(0.0, 0.0, 0.0, 1.0),
+        }
+
+    def encode(self, text, normalize_embeddings, convert_to_numpy):
+        return self.vectors[text]
+
+
+def _reject(value):
+    raise ValueError("rejected")
+
+
+class CacheTestCase(unittest.IsolatedAsyncioTestCase):
+    """Gives every test an empty cache file and caching switched on."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "cache.pkl")
+
+        patcher = mock.patch.object(cache, "CACHE_ENABLED", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_cache(self, **kwargs) -> SemanticCache:
+        kwargs.setdefault("model_name", "fake")
+        return SemanticCache(self.path, 0.95, **kwargs)
+
+
+class AsyncLruCacheTest(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.calls = []
+
+        @async_lru_cache(maxsize=2)
+        async def lookup(key, suffix=""):
+            self.calls.append(key)
+            return {"key": key + suffix}
+
+        self.lookup = lookup
+
+    async def test_repeated_calls_are_served_from_cache(self):
+        self.assertEqual(await self.lookup("a"), {"key": "a"})
+        self.assertEqual(await self.lookup("a"), {"key": "a"})
+        self.assertEqual(self.calls, ["a"])
+
+    async def test_keyword_arguments_are_part_of_the_key(self):
+        await self.lookup("a", suffix="!")
+        self.assertEqual(await self.lookup("a"), {"key": "a"})
+        self.assertEqual(self.calls, ["a", "a"])
+
+    async def test_least_recently_used_entry_is_evicted(self):
+        await self.lookup("a")
+        await self.lookup("b")
+        await self.lookup("a")  # "b" is now least recently used.
+        await self.lookup("c")
+        await self.lookup("a")
+        await self.lookup("b")
+        self.assertEqual(self.calls, ["a", "b", "c", "b"])
+
+    async def test_returned_results_are_copies(self):
+        (await self.lookup("a"))["key"] = "mutated"
+        self.assertEqual(await self.lookup("a"), {"key": "a"})
+
+    async def test_cache_clear(self):
+        await self.lookup("a")
+        self.lookup.cache_clear()
+        await self.lookup("a")
+        self.assertEqual(self.calls, ["a", "a"])
+
+    async def test_disabled_cache_always_calls_through(self):
+        with mock.patch.object(cache, "CACHE_ENABLED", False):
+            await self.lookup("a")
+            await self.lookup("a")
+        self.assertEqual(self.calls, ["a", "a"])
+
+
+class ExactCacheTest(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.llm_cache = self.make_cache()
+        self.replies = []
+
+        @self.llm_cache.cached
+        async def llm(system, user):
+            return self.replies.pop(0)
+
+        self.llm = llm
+
+    async def test_identical_prompts_hit(self):
+        self.replies = ["first"]
+        self.assertEqual(await self.llm("sys", "user"), "first")
+        self.assertEqual(await self.llm("sys", "user"), "first")
+
+    async def test_different_system_prompts_miss(self):
+        self.replies = ["first", "second"]
+        await self.llm("sys", "user")
+        self.assertEqual(await self.llm("other", "user"), "second")
+
+    async def test_rejected_reply_is_raised_and_not_stored(self):
+        self.replies = ["bad"]
+        with self.assertRaises(ValueError):
+            await self.llm("sys", "user", validate=_reject)
+        self.assertIsNone(self.llm_cache.get("sys", "user"))
+
+    async def test_cached_reply_failing_validation_is_refetched(self):
+        self.llm_cache.put("sys", "user", "stale")
+        self.replies = ["fresh"]
+
+        def validate(reply):
+            if reply == "stale":
+                raise ValueError(reply)
+
+        self.assertEqual(await self.llm("sys", "user", validate=validate), "fresh")
+        self.assertEqual(self.llm_cache.get("sys", "user"), "fresh")
+
+    def test_least_recently_used_entries_are_evicted(self):
+        small = self.make_cache(max_entries=2)
+        small.put("sys", "a", "A")
+        small.put("sys", "b", "B")
+        small.get("sys", "a")
+        small.put("sys", "c", "C")
+        self.assertIsNone(small.get("sys", "b"))
+        self.assertEqual(small.get("sys", "a"), "A")
+
+    def test_save_and_load_round_trip(self):
+        self.llm_cache.put("sys", "user", "reply")
+        self.llm_cache.save()
+        self.assertEqual(self.make_cache().get("sys", "user"), "reply")
+
+    def test_load_trims_to_max_entries(self):
+        for user in "abc":
+            self.llm_cache.put("sys", user, user.upper())
+        self.llm_cache.save()
+        small = self.make_cache(max_entries=1)
+        self.assertEqual(small.get("sys", "c"), "C")
+        self.assertIsNone(small.get("sys", "a"))
+
+    def test_save_is_skipped_when_unchanged(self):
+        self.llm_cache.save()
+        self.assertFalse(os.path.exists(self.path))
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class EmbeddingMatrixTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.vectors = rng.standard_normal((600, 8)).astype(np.float32)
+        self.vectors /= np.linalg.norm(self.vectors, axis=1, keepdims=True)
+
+    def test_capacity_doubles_and_keeps_rows(self):
+        matrix = cache._EmbeddingMatrix(8, capacity=2)
+        for vector in self.vectors[:5]:
+            matrix.add(vector)
+        self.assertEqual(matrix.size, 5)
+        self.assertEqual(len(matrix._data), 8)
+        np.testing.assert_allclose(matrix.rows(), self.vectors[:5], atol=0.01)
+
+    def test_search_finds_nearest_row_across_chunks(self):
+        matrix = cache._EmbeddingMatrix(8)
+        for vector in self.vectors:
+            matrix.add(vector)
+        for row in (0, cache._SEARCH_CHUNK_ROWS - 1, cache._SEARCH_CHUNK_ROWS, 599):
+            with self.subTest(row=row):
+                similarity, found = matrix.search(self.vectors[row])
+                self.assertEqual(found, row)
+                self.assertAlmostEqual(similarity, 1.0, delta=0.01)
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class SemanticCacheTest(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(cache, "SentenceTransformer", FakeModel)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.llm_cache = self.make_cache()
+        self.replies = []
+
+        @self.llm_cache.cached
+        async def llm(system, user):
+            return self.replies.pop(0)
+
+        self.llm = llm
+
+    async def test_near_identical_prompt_hits(self):
+        self.replies = ["billing"]
+        await self.llm("sys", "charged twice", semantic=True)
+        self.assertEqual(await self.llm("sys", "double charged", semantic=True), "billing")
+
+    async def test_semantic_layer_is_opt_in(self):
+        self.replies = ["billing", "fresh"]
+        await self.llm("sys", "charged twice", semantic=True)
+        self.assertEqual(await self.llm("sys", "double charged"), "fresh")
+
+    async def test_dissimilar_prompt_misses(self):
+        self.replies = ["billing", "outage"]
+        await self.llm("sys", "charged twice", semantic=True)
+        self.assertEqual(await self.llm("sys", "server is down", semantic=True), "outage")
+
+    async def test_partitioned_by_system_prompt(self):
+        self.replies = ["billing", "other"]
+        await self.llm("sys", "charged twice", semantic=True)
+        self.assertEqual(await self.llm("other", "double charged", semantic=True), "other")
+
+    async def test_quantised_rows_survive_save_and_load(self):
+        self.replies = ["billing"]
+        await self.llm("sys", "charged twice", semantic=True)
+        self.llm_cache.save()
+
+        loaded = self.make_cache()
+        vector = await loaded.embed("double charged")
+        self.assertEqual(loaded.get("sys", "double charged", vector), "billing")
+
+    async def test_load_drops_semantic_entries_from_another_model(self):
+        self.replies = ["billing"]
+        await self.llm("sys", "charged twice", semantic=True)
+        self.llm_cache.save()
+
+        loaded = self.make_cache(model_name="other")
+        vector = await loaded.embed("double charged")
+        self.assertIsNone(loaded.get("sys", "double charged", vector))
+        self.assertEqual(loaded.get("sys", "charged twice"), "billing")
+
+    async def test_load_drops_semantic_entries_from_older_format(self):
+        self.replies = ["billing"]
+        await self.llm("sys", "charged twice", semantic=True)
+        self.llm_cache.save()
+        with open(self.path, "rb") as f:
+            state = pickle.load(f)
+        state["version"] = cache._FORMAT_VERSION - 1
+        with open(self.path, "wb") as f:
+            pickle.dump(state, f)
+
+        loaded = self.make_cache()
+        vector = await loaded.embed("double charged")
+        self.assertIsNone(loaded.get("sys", "double charged", vector))
+
+        loaded.save()  # The dropped entries must not be written back.
+        with open(self.path, "rb") as f:
+            self.assertEqual(pickle.load(f)["semantic"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+test_parsing.py — Unit tests for parsing.py
+============================================
+
+Run with::
+
+    python -m unittest test_parsing
+"""
+
+import unittest
+
+from parsing import json_object_end, regex_entities
+
+
+class RegexEntitiesTest(unittest.TestCase):
+    def test_sample_billing_ticket(self):
+        entities = regex_entities(
+            "Hi, I'm John Smith (order #ORD-98432). I was charged twice for my "
+            "subscription on Jan 5 2026. The amount of $49.99 appeared two times "
+            "on my credit card ending 4821. My email is john.smith@email.com."
+        )
+        self.assertEqual(entities["order_id"], ["ORD-98432"])
+        self.assertEqual(entities["dates"], ["Jan 5 2026"])
+        self.assertEqual(entities["contact_info"], ["john.smith@email.com"])
+        self.assertIsNone(entities["customer_name"])
+
+    def test_no_matches_returns_all_none(self):
+        entities = regex_entities("Do you offer discounts for universities?")
+        self.assertTrue(all(value is None for value in entities.values()))
+
+    def test_phone_numbers(self):
+        entities = regex_entities("Call +1 (555) 123-4567 or 555-1234.")
+        self.assertEqual(entities["contact_info"], ["+1 (555) 123-4567", "555-1234"])
+
+    def test_card_numbers_are_not_contact_info(self):
+        for card in ("4111 1111 1111 1111", "4111-1111-1111-1111", "3782 822463 10005", "4222222222222"):
+            with self.subTest(card=card):
+                entities = regex_entities(f"My card number {card} was charged")
+                self.assertIsNone(entities["contact_info"])
+
+    def test_too_few_or_too_many_digits_are_not_phones(self):
+        entities = regex_entities("Ref 12345 and serial 1234567890123456789012")
+        self.assertIsNone(entities["contact_info"])
+
+    def test_dates_and_order_ids_are_not_phones(self):
+        entities = regex_entities("Order REF-1234567890 placed on 2026-01-05.")
+        self.assertEqual(entities["order_id"], ["REF-1234567890"])
+        self.assertEqual(entities["dates"], ["2026-01-05"])
+        self.assertIsNone(entities["contact_info"])
+
+    def test_duplicates_are_removed(self):
+        entities = regex_entities("ORD-1 again ORD-1, mail a@b.com or a@b.com")
+        self.assertEqual(entities["order_id"], ["ORD-1"])
+        self.assertEqual(entities["contact_info"], ["a@b.com"])
+
+
+class JsonObjectEndTest(unittest.TestCase):
+    def test_complete_object_with_trailing_text(self):
+        text = '{"a": {"b": 1}} trailing'
+        self.assertEqual(text[: json_object_end(text)], '{"a": {"b": 1}}')
+
+    def test_incomplete_object(self):
+        self.assertEqual(json_object_end('{"a": {"b": 1}'), -1)
+        self.assertEqual(json_object_end(""), -1)
+
+    def test_braces_inside_strings_are_ignored(self):
+        text = '{"a": "}{", "b": "{"}'
+        self.assertEqual(json_object_end(text), len(text))
+
+    def test_escaped_quotes_inside_strings(self):
+        self.assertEqual(json_object_end('{"a": "\\"}"'), -1)
+        text = '{"a": "\\"}"}'
+        self.assertEqual(json_object_end(text), len(text))
+
+    def test_leading_whitespace(self):
+        text = '  \n{"a": 1}'
+        self.assertEqual(json_object_end(text), len(text))
+
+
+if __name__ == "__main__":
+    unittest.main()